@@ -0,0 +1,485 @@
+"""
+Shared helpers for fetching, parsing, and rendering hardware job listings.
+"""
+
+import csv
+import html
+import io
+import json
+import mmap
+import os
+import re
+from collections.abc import Iterable
+from email.utils import formatdate
+from hashlib import blake2b
+from itertools import chain
+from typing import NamedTuple
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser
+
+# Directory for data persisted between runs (HTTP validators, response bodies)
+CACHE_DIR = ".cache"
+
+# Cache file holding the signature of the jobs rendered into README.md and
+# the digest of that README
+JOBS_SIGNATURE_NAME = "last_jobs.sig"
+
+# Shared session so both fetches reuse pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.headers["Accept-Encoding"] = "gzip, deflate"
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+# Expected column headers (case-insensitive matching), in Job field order
+EXPECTED_COLUMNS = ["company", "role", "location", "apply link", "age"]
+EXPECTED_SET = frozenset(EXPECTED_COLUMNS)
+
+# Upper bound on the hardware section size used when searching for its end
+MAX_SECTION_CHARS = 1 << 20
+
+# Matches closed positions (🔒) and continuation rows (↳) in the data source
+SKIP_ROW_RE = re.compile(r'🔒|>↳<|<td>↳</td>')
+
+# Matches the "Last updated" line so it can be ignored when comparing READMEs
+TS_RE = re.compile(r'(?m)^\*\*Last updated:\*\*.*\n?')
+TS_PREFIX = b"**Last updated:**"
+
+# Translation table for escaping pipe characters in table cells
+PIPE_ESCAPE = str.maketrans({"|": "\\|"})
+
+
+class Job(NamedTuple):
+    """A single job listing; fields missing from a source default to ""."""
+
+    company: str
+    role: str
+    location: str = ""
+    apply_link: str = ""
+    age: str = ""
+
+
+def load_cache_meta(cache_name: str, url: str) -> dict | None:
+    """Return the metadata saved with the body cached under CACHE_DIR/cache_name.
+
+    Returns None if nothing usable is cached for url.
+    """
+    meta_path = os.path.join(CACHE_DIR, cache_name + ".json")
+    body_path = os.path.join(CACHE_DIR, cache_name)
+    if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+        return None
+
+    # A corrupt or unreadable cache is treated as a miss, never as an error
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if not isinstance(meta, dict) or meta.get("url") != url:
+            return None
+        if not all(isinstance(meta.get(key), (str, type(None))) for key in ("etag", "last_modified", "encoding")):
+            return None
+
+        # Fall back to the cached body's mtime if the server never sent Last-Modified
+        if not meta.get("last_modified"):
+            meta["last_modified"] = formatdate(os.path.getmtime(body_path), usegmt=True)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Ignoring unreadable cache for {cache_name}: {e}")
+        return None
+
+    return meta
+
+
+def conditional_get(url: str, meta: dict | None, stream: bool = False) -> requests.Response | None:
+    """GET url, sending the validators from meta (see load_cache_meta).
+
+    Returns None if the server answered 304, meaning the cached body is still
+    current. Without meta this is a plain GET and never returns None.
+    """
+    headers = {}
+    if meta is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        headers["If-Modified-Since"] = meta["last_modified"]
+
+    # Close responses we don't hand back so streamed ones release their connection
+    response = SESSION.get(url, headers=headers, stream=stream, timeout=30)
+    if response.status_code == 304:
+        response.close()
+        return None
+    try:
+        response.raise_for_status()
+    except requests.HTTPError:
+        response.close()
+        raise
+    return response
+
+
+def discard_cache_meta(cache_name: str) -> None:
+    """Remove the metadata for cache_name before its body is replaced.
+
+    If writing the new body or metadata then fails, the old validators can no
+    longer be sent for a body they do not describe.
+    """
+    try:
+        os.remove(os.path.join(CACHE_DIR, cache_name + ".json"))
+    except FileNotFoundError:
+        pass
+
+
+def save_cache_meta(cache_name: str, url: str, response: requests.Response, encoding: str) -> None:
+    """Record the validators for a body already written to CACHE_DIR/cache_name."""
+    meta = {
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "encoding": encoding,
+    }
+    atomic_write(os.path.join(CACHE_DIR, cache_name + ".json"), json.dumps(meta))
+
+
+class TeeReader(io.RawIOBase):
+    """Binary stream that copies every chunk read from source into sink.
+
+    If sink is None or a write to it fails, copying stops (see `failed`) but
+    reading carries on. source.read(n) may return more than n bytes (urllib3
+    1.x does when decompressing), so any excess is held for the next call.
+    """
+
+    def __init__(self, source, sink):
+        self.source = source
+        self.sink = sink
+        self.failed = sink is None
+        self.pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.pending
+        if not data:
+            data = self.source.read(len(buffer))
+            if not self.failed:
+                try:
+                    self.sink.write(data)
+                except OSError as e:
+                    print(f"Warning: Could not write cache: {e}")
+                    self.failed = True
+
+        n = min(len(buffer), len(data))
+        buffer[:n] = data[:n]
+        self.pending = data[n:]
+        return n
+
+
+def csv_text(raw, encoding: str) -> io.TextIOWrapper:
+    """Decode a binary CSV stream, keeping line terminators (newline="") for csv.
+
+    Undecodable bytes are replaced, as response.text would do.
+    """
+    return io.TextIOWrapper(io.BufferedReader(raw), encoding=encoding, errors="replace", newline="")
+
+
+def parse_csv(csv_lines: Iterable[str]) -> list[Job]:
+    """Parse CSV lines and return list of job entries."""
+    reader = csv.DictReader(csv_lines)
+
+    # Normalize column names to lowercase for matching
+    if reader.fieldnames is None:
+        return []
+
+    # Create mapping from expected columns to actual column names
+    column_mapping = {}
+    for field in reader.fieldnames:
+        field_lower = field.lower().strip()
+        if field_lower in EXPECTED_SET:
+            column_mapping[field_lower] = field
+            continue
+        for expected in EXPECTED_COLUMNS:
+            if expected in field_lower or field_lower in expected:
+                column_mapping[expected] = field
+                break
+
+    # Actual column name for each Job field (None if the sheet lacks it)
+    field_columns = tuple(column_mapping.get(expected) for expected in EXPECTED_COLUMNS)
+
+    jobs = []
+    for row in reader:
+        # Short rows yield None for missing fields, hence the `or ""`
+        job = Job(*((row.get(actual) or "").strip() if actual else "" for actual in field_columns))
+
+        # Only include rows that have at least company and role
+        if job.company and job.role:
+            jobs.append(job)
+
+    return jobs
+
+
+def fetch_sheet_jobs(url: str) -> list[Job]:
+    """Fetch and parse the published Google Sheet CSV.
+
+    The body is parsed as it streams in and copied verbatim to the cache; an
+    unchanged sheet (HTTP 304) is parsed from the cached bytes through the
+    same reader, so both paths yield identical jobs.
+    """
+    cache_name = "sheet.csv"
+    body_path = os.path.join(CACHE_DIR, cache_name)
+    tmp_path = body_path + ".tmp"
+    meta = load_cache_meta(cache_name, url)
+
+    response = conditional_get(url, meta, stream=True)
+    if response is None:
+        try:
+            with open(body_path, "rb") as f:
+                return parse_csv(csv_text(f, meta.get("encoding") or "utf-8"))
+        except (OSError, ValueError, LookupError, csv.Error) as e:
+            print(f"Warning: Ignoring unreadable cache for {cache_name}: {e}")
+            response = conditional_get(url, None, stream=True)
+
+    encoding = response.encoding or "utf-8"
+    # Keep urllib3 from closing the stream at EOF underneath the text wrapper
+    response.raw.decode_content = True
+    response.raw.auto_close = False
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        discard_cache_meta(cache_name)
+        sink = open(tmp_path, "wb")
+    except OSError as e:
+        print(f"Warning: Could not write cache: {e}")
+        sink = None
+
+    with response:
+        tee = TeeReader(response.raw, sink)
+        try:
+            jobs = parse_csv(csv_text(tee, encoding))
+        # Reading response.raw bypasses requests' own error translation, so
+        # map failures back to RequestException for the caller
+        except urllib3.exceptions.HTTPError as e:
+            raise requests.ConnectionError(e) from e
+        except (ValueError, csv.Error) as e:
+            raise requests.ContentDecodingError(e) from e
+        finally:
+            if sink is not None:
+                try:
+                    sink.close()
+                except OSError as e:
+                    print(f"Warning: Could not write cache: {e}")
+                    tee.failed = True
+
+    if not tee.failed:
+        try:
+            os.replace(tmp_path, body_path)
+            save_cache_meta(cache_name, url, response, encoding)
+        except OSError as e:
+            print(f"Warning: Could not write cache: {e}")
+    return jobs
+
+
+def fetch_readme(url: str) -> str:
+    """Fetch the README content from the primary data source.
+
+    An unchanged README (HTTP 304) is read from the cache instead.
+    """
+    cache_name = "source_readme.md"
+    body_path = os.path.join(CACHE_DIR, cache_name)
+
+    meta = load_cache_meta(cache_name, url)
+    response = conditional_get(url, meta)
+    if response is None:
+        try:
+            with open(body_path, "r", encoding="utf-8", newline="") as f:
+                return f.read()
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable cache for {cache_name}: {e}")
+            response = conditional_get(url, None)
+
+    # Cached as decoded text, written and read back without newline translation
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        discard_cache_meta(cache_name)
+        atomic_write(body_path, response.text)
+        save_cache_meta(cache_name, url, response, "utf-8")
+    except OSError as e:
+        print(f"Warning: Could not write cache: {e}")
+    return response.text
+
+
+def cell_text(node) -> str:
+    """Return a node's text with entities re-escaped, as it appeared in the source.
+
+    Text nodes are joined as-is so words split by inline markup keep their
+    surrounding whitespace.
+    """
+    return html.escape(node.text().strip(), quote=False)
+
+
+def parse_hardware_jobs(readme: str) -> list[Job]:
+    """Parse hardware internships from the primary data source README."""
+    # Find the hardware engineering section
+    hw_section_header = "## 🔧 Hardware Engineering"
+    hw_start = readme.find(hw_section_header)
+    if hw_start == -1:
+        print("Warning: Hardware Engineering section not found")
+        return []
+
+    # Find the next section (starts with ##), looking in a bounded window
+    # first. If that misses, resume just before the window's end so a
+    # heading straddling the boundary is still found without rescanning.
+    search_start = hw_start + len(hw_section_header)
+    hw_end = readme.find("\n## ", search_start, search_start + MAX_SECTION_CHARS)
+    if hw_end == -1:
+        hw_end = readme.find("\n## ", search_start + MAX_SECTION_CHARS - len("\n## ") + 1)
+    if hw_end == -1:
+        hw_section = readme[hw_start:]
+    else:
+        hw_section = readme[hw_start:hw_end]
+
+    # Parse table rows
+    jobs = []
+    tree = LexborHTMLParser(hw_section)
+    for tr in tree.css('tr'):
+        row = tr.html
+
+        # Skip closed positions (🔒) and continuation rows (↳)
+        if SKIP_ROW_RE.search(row):
+            continue
+
+        # Extract table cells
+        cells = tr.css('td')
+        if len(cells) < 5:
+            continue
+
+        # Cell 0: Company name (in <strong><a href="...">NAME</a></strong>)
+        company_link = cells[0].css_first('a')
+        company = cell_text(company_link) if company_link else ""
+
+        # Cell 1: Role title
+        role = cell_text(cells[1])
+
+        # Cell 2: Location
+        location = cell_text(cells[2])
+
+        # Cell 3: Apply link (first href in the cell)
+        apply_link = cells[3].css_first('a')
+        apply_url = (apply_link.attributes.get('href') or "").strip() if apply_link else ""
+
+        # Cell 4: Age (e.g., "2d", "1w")
+        age = cell_text(cells[4])
+
+        # Only include if we have company and role
+        if company and role:
+            jobs.append(Job(company, role, location, apply_url, age))
+
+    return jobs
+
+
+def merge_jobs(sheet_jobs: list[Job], source_jobs: list[Job]) -> list[Job]:
+    """Merge jobs from both sources, deduplicating by (company, role)."""
+    # Dicts preserve insertion order, so sheet jobs keep priority
+    merged = {}
+    for job in chain(sheet_jobs, source_jobs):
+        key = (job.company.lower(), job.role.lower())
+        if key not in merged:
+            merged[key] = job
+
+    return list(merged.values())
+
+
+def generate_table_row(job: Job) -> str:
+    """Generate a markdown table row for a job entry."""
+    # Escape pipe characters in content
+    company = job.company.translate(PIPE_ESCAPE)
+    role = job.role.translate(PIPE_ESCAPE)
+    location = job.location.translate(PIPE_ESCAPE)
+    age = job.age.translate(PIPE_ESCAPE)
+
+    # Create apply button/link (HTML used for target="_blank")
+    if job.apply_link:
+        apply_cell = f'<a href="{job.apply_link}" target="_blank">Apply</a>'
+    else:
+        apply_cell = "—"
+
+    return f"| {company} | {role} | {location} | {apply_cell} | {age} |\n"
+
+
+def jobs_signature(jobs: list[Job]) -> str:
+    """Hash the job list in output order, so reordering counts as a change."""
+    records = ("\x1f".join(job) for job in jobs)
+    return blake2b("\x1e".join(records).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def load_jobs_signature() -> tuple[str, bytes] | None:
+    """Return the (job signature, README digest) saved by the last update, if any."""
+    try:
+        with open(os.path.join(CACHE_DIR, JOBS_SIGNATURE_NAME), "r", encoding="utf-8") as f:
+            signature, readme_digest = f.read().split()
+        return signature, bytes.fromhex(readme_digest)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Warning: Ignoring unreadable cache for {JOBS_SIGNATURE_NAME}: {e}")
+        return None
+
+
+def save_jobs_signature(signature: str, readme_digest: bytes) -> None:
+    """Persist the job signature with the digest of the README it produced."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        atomic_write(os.path.join(CACHE_DIR, JOBS_SIGNATURE_NAME), f"{signature} {readme_digest.hex()}\n")
+    except OSError as e:
+        print(f"Warning: Could not write cache: {e}")
+
+
+def strip_timestamp(content: str) -> str:
+    """Remove the "Last updated" line from README content."""
+    return TS_RE.sub("", content, count=1)
+
+
+def atomic_write(path: str, content: str) -> None:
+    """Write content to a temp file and rename it over path."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def content_digest(content: str) -> bytes:
+    """Hash README content, ignoring the timestamp line."""
+    return blake2b(strip_timestamp(content).encode("utf-8")).digest()
+
+
+def file_digest(path: str) -> bytes | None:
+    """Hash a README file on disk, ignoring the timestamp line.
+
+    Returns None if the file does not exist.
+    """
+    h = blake2b()
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+
+    with f:
+        # mmap cannot map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return h.digest()
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Locate the first timestamp line (same one strip_timestamp removes)
+            if mm[:len(TS_PREFIX)] == TS_PREFIX:
+                ts_start = 0
+            else:
+                ts_start = mm.find(b"\n" + TS_PREFIX)
+                if ts_start != -1:
+                    ts_start += 1
+
+            with memoryview(mm) as view:
+                if ts_start == -1:
+                    h.update(view)
+                else:
+                    ts_end = mm.find(b"\n", ts_start)
+                    ts_end = len(mm) if ts_end == -1 else ts_end + 1
+                    h.update(view[:ts_start])
+                    h.update(view[ts_end:])
+
+    return h.digest()